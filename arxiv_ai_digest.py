@@ -8,6 +8,7 @@ import random
 from google import genai
 from google.genai import types
 from datetime import date, timedelta
+from paper_reranker import rerank_papers
 
 # --- 0. 依赖检查 ---
 try:
@@ -23,6 +24,12 @@ logger = logging.getLogger(__name__)
 # --- 2. 核心配置 ---
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 ARCHIVE_DIR = "archive"
+# 每个领域最多抓取的论文数；调大到上千篇时由分批评分保证内存有界
+MAX_RESULTS = 120
+# 每凑满这么多篇就送去评分一次（默认与 MAX_RESULTS 相同，即每个领域只调用一次 Gemini）
+SCORING_BATCH_SIZE = 120
+# 多批次合并后最终保留的精选数
+MAX_PICKS = 15
 
 # 3个超级核心配置 (V19)
 YOUR_DOMAINS_OF_INTEREST = {
@@ -71,9 +78,47 @@ YOUR_DOMAINS_OF_INTEREST = {
 }
 
 # --------------------------------------------------------------------------
-# 抓取函数 (V20 - 抗限流增强)
+# 论文记录 (V23 - 紧凑的 slotted 对象，兼容原先的 dict 读法)
 # --------------------------------------------------------------------------
-def fetch_papers_for_domain(domain_name, categories, extra_query, target_date):
+class PaperRecord:
+    __slots__ = ('id', 'title', 'summary', 'authors', 'pdf_url', 'categories')
+
+    def __init__(self, id, title, summary, authors, pdf_url, categories):
+        self.id = id
+        self.title = title
+        self.summary = summary
+        self.authors = authors
+        self.pdf_url = pdf_url
+        self.categories = categories
+
+    @property
+    def url(self):
+        return self.id
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'summary': self.summary,
+            'authors': self.authors,
+            'url': self.url,
+            'pdf_url': self.pdf_url,
+            'categories': self.categories
+        }
+
+# --------------------------------------------------------------------------
+# 抓取函数 (V23 - 流式生成，边翻页边产出)
+# --------------------------------------------------------------------------
+def fetch_papers_for_domain(domain_name, categories, extra_query, target_date, max_results=MAX_RESULTS):
     logger.info(f"--- 正在为领域 {domain_name} (日期 {target_date}) 抓取论文 ---")
    
     date_str = target_date.strftime("%Y%m%d")
@@ -84,11 +129,13 @@ def fetch_papers_for_domain(domain_name, categories, extra_query, target_date):
    
     search = arxiv.Search(
         query=full_query,
-        max_results=120,  # 维持 120 篇
+        max_results=max_results,
         sort_by=arxiv.SortCriterion.SubmittedDate,
         sort_order=arxiv.SortOrder.Descending
     )
-    papers_list = []
+    count = 0
+    # arXiv 翻页偶尔会跨页重复返回同一篇，只记 id，内存开销很小
+    seen_ids = set()
     try:
         # --- 关键修复：延迟大幅提升 + 重试次数增加 ---
         client = arxiv.Client(
@@ -97,20 +144,48 @@ def fetch_papers_for_domain(domain_name, categories, extra_query, target_date):
             num_retries=8         
         )
        
+        # client.results 按页懒加载，每到一篇就立即交给下游
         for result in client.results(search):
-            papers_list.append({
-                'id': result.entry_id,
-                'title': result.title,
-                'summary': result.summary.replace("\n", " "),
-                'authors': ", ".join([a.name for a in result.authors]),
-                'url': result.entry_id,
-                'pdf_url': result.pdf_url
-            })
-        logger.info(f"为 {domain_name} 抓取到 {len(papers_list)} 篇论文。")
-        return papers_list
+            if result.entry_id in seen_ids:
+                continue
+            seen_ids.add(result.entry_id)
+            count += 1
+            yield PaperRecord(
+                result.entry_id,
+                result.title,
+                result.summary.replace("\n", " "),
+                ", ".join([a.name for a in result.authors]),
+                result.pdf_url,
+                result.categories
+            )
     except Exception as e:
-        logger.error(f"抓取 arXiv 失败: {e}")
-        return []
+        logger.error(f"抓取 arXiv 失败 (已产出 {count} 篇): {e}")
+    logger.info(f"为 {domain_name} 抓取到 {count} 篇论文。")
+
+def iter_batches(papers, batch_size=SCORING_BATCH_SIZE):
+    batch = []
+    for paper in papers:
+        batch.append(paper)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def pick_total_score(pick_item):
+    scores = pick_item.get('scores')
+    if not isinstance(scores, dict):
+        return 0
+    total = 0.0
+    for value in scores.values():
+        # Gemini 有时把分数返回成字符串 ("5")；bool 不算分
+        if isinstance(value, bool):
+            continue
+        try:
+            total += float(value)
+        except (TypeError, ValueError):
+            continue
+    return total
 
 # --------------------------------------------------------------------------
 # (V19) AI 分析函数 - 带智能重试机制 (Top 5)
@@ -227,15 +302,35 @@ if __name__ == "__main__":
             extra_query=config["search_query"],
             target_date=target_date
         )
-       
-        picks_list_json = get_ai_editor_pick(papers, config["name_en"], config["ai_preference_prompt"])
-        final_data_list = []
-        if picks_list_json:
-            for pick_item in picks_list_json:
-                full_paper = next((p for p in papers if p['id'] == pick_item.get('id')), None)
-                if full_paper:
-                    final_data_list.append({**full_paper, **pick_item})
-       
+
+        # 流式：每凑满一批就评分，只保留被选中的论文，内存随批大小而非 max_results 增长
+        picks_by_id = {}
+        num_batches = 0
+        for batch in iter_batches(papers):
+            num_batches += 1
+            # 本地反馈模型先排序并截断候选，缩小发给 Gemini 的 prompt
+            batch = rerank_papers(batch, domain_key)
+
+            picks_list_json = get_ai_editor_pick(batch, config["name_en"], config["ai_preference_prompt"])
+            if picks_list_json:
+                batch_by_id = {p.id: p for p in batch}
+                for pick_item in picks_list_json:
+                    if not isinstance(pick_item, dict):
+                        continue
+                    full_paper = batch_by_id.get(pick_item.get('id'))
+                    if not full_paper:
+                        continue
+                    # 按 id 去重：同一篇被多次选中时保留总分更高的那条
+                    existing = picks_by_id.get(full_paper.id)
+                    if existing is None or pick_total_score(pick_item) > pick_total_score(existing):
+                        picks_by_id[full_paper.id] = {**full_paper.to_dict(), **pick_item}
+
+            # 多批次时按总分滚动合并，保持精选数量与单批次一致
+            if num_batches > 1:
+                ranked = sorted(picks_by_id.values(), key=pick_total_score, reverse=True)[:MAX_PICKS]
+                picks_by_id = {item['id']: item for item in ranked}
+
+        final_data_list = list(picks_by_id.values())
         if not final_data_list:
              final_data_list = None
         output_path = os.path.join(ARCHIVE_DIR, domain_key, f"{target_date.isoformat()}.json")
@@ -0,0 +1,254 @@
+import os
+import re
+import json
+import math
+import zlib
+import logging
+from datetime import datetime, timezone
+
+# --- 0. 依赖检查 ---
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# --- 1. 核心配置 ---
+FEEDBACK_DIR = "feedback"
+# 特征哈希维度 (2^16)，无需维护词表
+FEATURE_DIM = 1 << 16
+# 至少积累这么多条反馈（且同时有喜欢/不喜欢）才启用重排
+RERANK_MIN_FEEDBACK = 20
+# 重排后交给 Gemini 的候选上限
+RERANK_KEEP = 60
+LEARNING_RATE = 0.5
+L2_REG = 1e-4
+EPOCHS = 8
+
+TOKEN_RE = re.compile(r"[a-z][a-z0-9\-]{2,}")
+STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "our", "which", "can", "its",
+    "these", "their", "such", "into", "has", "have", "been", "was", "were", "also", "than",
+    "using", "based", "via", "not", "but", "both", "while", "over", "under", "show", "paper",
+    "propose", "proposed", "method", "methods", "results", "approach", "new", "how",
+}
+
+
+# --------------------------------------------------------------------------
+# 反馈存储 (每个领域一个追加写入的 JSONL 文件)
+#
+# 注意：反馈写在运行 streamlit_app.py 的机器上，而重排模型在 GitHub Actions
+# 的 checkout 里训练。feedback/*.jsonl 必须从 App 所在机器提交进仓库
+# （或在 App 里用“导出反馈”下载后提交），否则 CI 中反馈数为 0，重排不会生效。
+# --------------------------------------------------------------------------
+def feedback_path(domain_key, feedback_dir=FEEDBACK_DIR):
+    return os.path.join(feedback_dir, f"{domain_key}.jsonl")
+
+
+def record_feedback(domain_key, paper, label, feedback_dir=FEEDBACK_DIR):
+    """记录一条反馈：label=1 表示喜欢，0 表示不感兴趣。保存论文特征字段，训练时无需重新抓取。"""
+    os.makedirs(feedback_dir, exist_ok=True)
+    entry = {
+        'id': paper.get('id'),
+        'label': int(label),
+        'title': paper.get('title', ''),
+        'summary': paper.get('summary', ''),
+        'authors': paper.get('authors', ''),
+        'categories': paper.get('categories', []),
+        'ts': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    with open(feedback_path(domain_key, feedback_dir), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def load_feedback(domain_key, feedback_dir=FEEDBACK_DIR):
+    """按写入顺序读取反馈；同一论文多次标记时以最后一次为准，返回 {id: entry}。"""
+    entries = {}
+    try:
+        with open(feedback_path(domain_key, feedback_dir), 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"跳过损坏的反馈记录: {line[:80]}")
+                    continue
+                if entry.get('id'):
+                    entries.pop(entry['id'], None)
+                    entries[entry['id']] = entry
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+# --------------------------------------------------------------------------
+# 特征：TF-IDF 词项 + 分类 + 作者，统一哈希到固定维度
+# --------------------------------------------------------------------------
+def _bucket(feature):
+    return zlib.crc32(feature.encode('utf-8')) % FEATURE_DIM
+
+
+def _categories(paper):
+    categories = paper.get('categories') or []
+    if isinstance(categories, str):
+        categories = [c.strip() for c in categories.split(",")]
+    return [c for c in categories if c]
+
+
+def paper_terms(paper):
+    """返回 (词项桶 -> 词频, 其他特征桶集合)。"""
+    text = f"{paper.get('title', '')} {paper.get('title', '')} {paper.get('summary', '')}".lower()
+    term_counts = {}
+    for token in TOKEN_RE.findall(text):
+        if token in STOPWORDS:
+            continue
+        bucket = _bucket("t:" + token)
+        term_counts[bucket] = term_counts.get(bucket, 0) + 1
+
+    other = set(_bucket("c:" + c) for c in _categories(paper))
+    other.update(_bucket("a:" + a.strip().lower()) for a in paper.get('authors', '').split(",") if a.strip())
+    return term_counts, other
+
+
+def vectorize(terms, df, n_docs):
+    """将 paper_terms 的结果转为 L2 归一化的稀疏向量 (indices, values)。"""
+    term_counts, other = terms
+    features = {}
+    total = sum(term_counts.values()) or 1
+    for bucket, count in term_counts.items():
+        idf = math.log((1 + n_docs) / (1 + df[bucket])) + 1.0
+        features[bucket] = (count / total) * idf
+    for bucket in other:
+        features[bucket] = features.get(bucket, 0.0) + 1.0
+
+    indices = np.fromiter(features.keys(), dtype=np.int64, count=len(features))
+    values = np.fromiter(features.values(), dtype=np.float64, count=len(features))
+    norm = np.linalg.norm(values)
+    if norm > 0:
+        values /= norm
+    return indices, values
+
+
+# --------------------------------------------------------------------------
+# 模型：稀疏逻辑回归，SGD 训练；反馈变化时从零重训（数据量小，代价很低）
+# --------------------------------------------------------------------------
+def model_path(domain_key, feedback_dir=FEEDBACK_DIR):
+    return os.path.join(feedback_dir, f"{domain_key}.model.npz")
+
+
+def _new_model():
+    return {
+        'w': np.zeros(FEATURE_DIM),
+        'b': 0.0,
+        'df': np.zeros(FEATURE_DIM),
+        'n_docs': 0,
+        'seen_ids': [],
+        'seen_labels': [],
+    }
+
+
+def _load_model(domain_key, feedback_dir):
+    try:
+        with np.load(model_path(domain_key, feedback_dir), allow_pickle=False) as data:
+            if data['w'].shape[0] != FEATURE_DIM:
+                return _new_model()
+            return {
+                'w': data['w'].copy(),
+                'b': float(data['b']),
+                'df': data['df'].copy(),
+                'n_docs': int(data['n_docs']),
+                'seen_ids': [str(i) for i in data['seen_ids']],
+                'seen_labels': [int(l) for l in data['seen_labels']],
+            }
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        return _new_model()
+
+
+def _save_model(model, domain_key, feedback_dir):
+    os.makedirs(feedback_dir, exist_ok=True)
+    np.savez_compressed(
+        model_path(domain_key, feedback_dir),
+        w=model['w'], b=model['b'], df=model['df'], n_docs=model['n_docs'],
+        seen_ids=np.array(model['seen_ids'], dtype=str),
+        seen_labels=np.array(model['seen_labels'], dtype=np.int8),
+    )
+
+
+def _sgd_epochs(model, rows, labels, epochs):
+    w = model['w']
+    b = model['b']
+    # 类别加权，避免“不感兴趣”远多于“喜欢”时模型退化为全部打低分
+    n_pos = float(labels.sum())
+    n_neg = float(len(labels) - n_pos)
+    class_weight = {1: len(labels) / (2 * n_pos), 0: len(labels) / (2 * n_neg)}
+    rng = np.random.default_rng(0)
+    for _ in range(epochs):
+        for k in rng.permutation(len(rows)):
+            indices, values = rows[k]
+            z = float(w[indices] @ values) + b
+            p = 1.0 / (1.0 + math.exp(-max(min(z, 30.0), -30.0)))
+            g = (p - labels[k]) * class_weight[int(labels[k])]
+            w[indices] -= LEARNING_RATE * (g * values + L2_REG * w[indices])
+            b -= LEARNING_RATE * g
+    model['b'] = b
+
+
+def train_model(domain_key, feedback_dir=FEEDBACK_DIR):
+    """
+    反馈与上次训练时一致则直接复用已保存的模型；有新增、改标或删除时
+    从新模型出发在全部反馈上重训，避免热启动反复训练旧样本导致权重漂移。
+    反馈不足时返回 None。
+    """
+    if np is None:
+        logger.warning("未找到 numpy 库，跳过本地重排。")
+        return None
+
+    feedback = load_feedback(domain_key, feedback_dir)
+    labels = np.array([e['label'] for e in feedback.values()], dtype=np.float64)
+    if len(labels) < RERANK_MIN_FEEDBACK or labels.min() == labels.max():
+        logger.info(f"{domain_key} 反馈不足 ({len(labels)} 条，来自 {feedback_path(domain_key, feedback_dir)})，暂不启用本地重排。")
+        return None
+
+    saved = _load_model(domain_key, feedback_dir)
+    seen = dict(zip(saved['seen_ids'], saved['seen_labels']))
+    new_ids = [pid for pid in feedback if pid not in seen]
+    # 没有新增、改标（喜欢 <-> 不感兴趣）或删除时直接复用已保存的模型
+    if len(seen) == len(feedback) and all(seen.get(pid) == e['label'] for pid, e in feedback.items()):
+        return saved
+
+    model = _new_model()
+    terms = {pid: paper_terms(entry) for pid, entry in feedback.items()}
+    for term_counts, _ in terms.values():
+        for bucket in term_counts:
+            model['df'][bucket] += 1
+    model['n_docs'] = len(terms)
+
+    rows = [vectorize(terms[pid], model['df'], model['n_docs']) for pid in feedback]
+    _sgd_epochs(model, rows, labels, EPOCHS)
+    model['seen_ids'] = list(feedback)
+    model['seen_labels'] = [int(e['label']) for e in feedback.values()]
+    _save_model(model, domain_key, feedback_dir)
+    logger.info(f"{domain_key} 重排模型已更新：新增 {len(new_ids)} 条，共 {len(labels)} 条反馈。")
+    return model
+
+
+def rerank_papers(papers, domain_key, keep=RERANK_KEEP, feedback_dir=FEEDBACK_DIR):
+    """按本地模型打分降序排列候选论文并截取前 keep 篇；模型不可用时原样返回。"""
+    if not papers:
+        return papers
+    model = train_model(domain_key, feedback_dir)
+    if model is None:
+        return papers
+
+    w, b, df, n_docs = model['w'], model['b'], model['df'], model['n_docs']
+    scores = []
+    for paper in papers:
+        indices, values = vectorize(paper_terms(paper), df, n_docs)
+        scores.append(float(w[indices] @ values) + b)
+    order = np.argsort(-np.array(scores), kind='stable')
+    ranked = [papers[i] for i in order[:keep]]
+    logger.info(f"本地重排：{len(papers)} 篇候选保留 {len(ranked)} 篇交给 AI。")
+    return ranked
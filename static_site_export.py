@@ -0,0 +1,368 @@
+import os
+import re
+import json
+import html
+import hashlib
+import logging
+import argparse
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+# --- 1. 配置 Logging ---
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# --- 2. 核心配置 ---
+ARCHIVE_DIR = "archive"
+# 写入 docs/，GitHub Pages 选择 "Deploy from a branch -> /docs" 即可直接发布
+SITE_DIR = "docs"
+MANIFEST_NAME = ".manifest.json"
+# 页面模板一旦修改就把版本号 +1，强制全量重建
+TEMPLATE_VERSION = 2
+# feed 只收录每个领域最近 N 个归档文件
+FEED_RECENT_FILES = 7
+SITE_TITLE = "私人 AI 总编辑 / Personal AI Editor"
+# 站点的公开地址（如 https://<user>.github.io/<repo>），feed 中的链接必须是绝对地址
+SITE_URL = os.environ.get('DIGEST_SITE_URL', '').rstrip('/')
+
+# 与 streamlit_app.py 保持一致
+YOUR_DOMAINS_OF_INTEREST = {
+    "phd_foundations": {
+        "name_zh": "AI 理论与统计基础",
+        "name_en": "AI Theory & Statistical Foundations"
+    },
+    "phd_methods": {
+        "name_zh": "前沿 AI 模型与应用",
+        "name_en": "Frontier AI Models & Applications"
+    },
+    "quant_crypto": {
+        "name_zh": "量化金融 (Crypto)",
+        "name_en": "Quantitative Finance (Crypto)"
+    }
+}
+
+TUTORIAL_DOMAIN = {
+    "tutorials": "每周教程精选"
+}
+
+DAILY_FILE_RE = re.compile(r"(\d{4}-\d{2}-\d{2})\.json")
+WEEKLY_FILE_RE = re.compile(r"(\d{4}-W\d{2})\.json")
+
+PAGE_STYLE = """
+body { font-family: -apple-system, "Segoe UI", "PingFang SC", sans-serif; max-width: 960px; margin: 2em auto; padding: 0 1em; color: #222; }
+a { color: #1f77b4; text-decoration: none; }
+.paper { border-bottom: 1px solid #ddd; padding: 1em 0; }
+.meta { color: #666; font-size: 0.9em; }
+.reason { background: #eef5fc; padding: 0.6em 0.8em; border-radius: 4px; }
+.core { background: #edf7ed; padding: 0.6em 0.8em; border-radius: 4px; }
+.scores span { display: inline-block; margin-right: 1em; }
+"""
+
+
+# --------------------------------------------------------------------------
+# 工具函数
+# --------------------------------------------------------------------------
+def file_sha256(file_path):
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_picks(file_path):
+    """读取归档文件，统一返回 dict 列表（兼容 null 与旧的单 dict 格式），同一论文 id 只保留第一次出现。"""
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        logger.error(f"JSON 文件损坏: {file_path}")
+        return []
+    picks = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+    unique_picks = []
+    seen_ids = set()
+    for pick in picks:
+        if not isinstance(pick, dict):
+            continue
+        # 部分归档文件同一论文出现两次；feed 条目 id 必须唯一
+        paper_id = pick.get('id')
+        if paper_id:
+            if paper_id in seen_ids:
+                continue
+            seen_ids.add(paper_id)
+        unique_picks.append(pick)
+    return unique_picks
+
+
+def load_manifest(site_dir):
+    manifest_path = os.path.join(site_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"template_version": TEMPLATE_VERSION, "sources": {}}
+    if manifest.get("template_version") != TEMPLATE_VERSION:
+        logger.info("模板版本变化，全部页面将重建。")
+        return {"template_version": TEMPLATE_VERSION, "sources": {}}
+    return manifest
+
+
+def write_text(file_path, text):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def scan_sources(archive_dir):
+    """返回 [(kind, domain_key, stem, source_path)]，kind 为 daily / weekly。"""
+    sources = []
+    for domain_key in YOUR_DOMAINS_OF_INTEREST:
+        domain_dir = os.path.join(archive_dir, domain_key)
+        if not os.path.isdir(domain_dir):
+            continue
+        for name in os.listdir(domain_dir):
+            match = DAILY_FILE_RE.fullmatch(name)
+            if match:
+                sources.append(("daily", domain_key, match.group(1), os.path.join(domain_dir, name)))
+    tutorial_dir = os.path.join(archive_dir, "tutorials")
+    if os.path.isdir(tutorial_dir):
+        for name in os.listdir(tutorial_dir):
+            match = WEEKLY_FILE_RE.fullmatch(name)
+            if match:
+                sources.append(("weekly", "tutorials", match.group(1), os.path.join(tutorial_dir, name)))
+    return sources
+
+
+def page_rel_path(domain_key, stem):
+    return f"{domain_key}/{stem}.html"
+
+
+# --------------------------------------------------------------------------
+# HTML 渲染
+# --------------------------------------------------------------------------
+def render_layout(title, body, root_prefix):
+    return (
+        "<!DOCTYPE html>\n<html lang=\"zh-CN\">\n<head>\n<meta charset=\"utf-8\">\n"
+        "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n"
+        f"<title>{html.escape(title)}</title>\n<style>{PAGE_STYLE}</style>\n"
+        f"<link rel=\"alternate\" type=\"application/feed+json\" href=\"{root_prefix}feed.json\">\n"
+        "</head>\n<body>\n"
+        f"<p><a href=\"{root_prefix}index.html\">← {html.escape(SITE_TITLE)}</a></p>\n"
+        f"{body}\n</body>\n</html>\n"
+    )
+
+
+def render_pick(i, pick):
+    esc = html.escape
+    parts = [
+        "<div class=\"paper\">",
+        f"<h3>{i}. <a href=\"{esc(pick.get('url', '#'))}\">{esc(pick.get('title', 'No Title'))}</a></h3>",
+        f"<p class=\"meta\"><b>作者 / Authors:</b> {esc(pick.get('authors', 'N/A'))}</p>",
+    ]
+    if pick.get('core_value_zh'):
+        parts.append(f"<p class=\"core\"><b>核心价值：</b> {esc(pick['core_value_zh'])}</p>")
+    scores = pick.get('scores')
+    if scores and isinstance(scores, dict):
+        spans = "".join(f"<span><b>{esc(str(k))}</b>: {esc(str(v))}</span>" for k, v in scores.items())
+        parts.append(f"<p class=\"scores\">{spans}</p>")
+    for key, label in (('reason_zh', "AI 编辑推荐理由"), ('reason_en', "AI Editor's Justification")):
+        if pick.get(key):
+            parts.append(f"<p class=\"reason\"><b>{label}:</b> {esc(pick[key])}</p>")
+    parts.append(f"<details><summary>查看摘要 / View Abstract</summary><p>{esc(pick.get('summary', 'N/A'))}</p></details>")
+    pdf_url = pick.get('pdf_url')
+    if pdf_url and pdf_url != '#':
+        parts.append(f"<p><a href=\"{esc(pdf_url)}\" target=\"_blank\"><b>下载 PDF / Download PDF</b></a></p>")
+    parts.append("</div>")
+    return "\n".join(parts)
+
+
+def render_picks_page(heading, picks, empty_text):
+    body = [f"<h1>{html.escape(heading)}</h1>"]
+    if picks:
+        body.extend(render_pick(i + 1, pick) for i, pick in enumerate(picks))
+    else:
+        body.append(f"<p>{html.escape(empty_text)}</p>")
+    return render_layout(heading, "\n".join(body), "../")
+
+
+def domain_title(domain_key):
+    if domain_key in YOUR_DOMAINS_OF_INTEREST:
+        config = YOUR_DOMAINS_OF_INTEREST[domain_key]
+        return f"{config['name_zh']} / {config['name_en']}"
+    return TUTORIAL_DOMAIN.get(domain_key, domain_key)
+
+
+def render_index(sources):
+    by_domain = {}
+    for kind, domain_key, stem, _ in sources:
+        by_domain.setdefault(domain_key, []).append(stem)
+
+    body = [f"<h1>{html.escape(SITE_TITLE)}</h1>",
+            "<p class=\"meta\"><a href=\"feed.json\">JSON Feed</a></p>"]
+    for domain_key in list(YOUR_DOMAINS_OF_INTEREST) + list(TUTORIAL_DOMAIN):
+        stems = sorted(by_domain.get(domain_key, []), reverse=True)
+        if not stems:
+            continue
+        body.append(f"<h2>{html.escape(domain_title(domain_key))}</h2>\n<ul>")
+        body.extend(f"<li><a href=\"{page_rel_path(domain_key, s)}\">{s}</a></li>" for s in stems)
+        body.append("</ul>")
+    return render_layout(SITE_TITLE, "\n".join(body), "")
+
+
+# --------------------------------------------------------------------------
+# Feed 渲染 (JSON Feed 1.1，可选 RSS / Atom)
+# --------------------------------------------------------------------------
+def stem_to_datetime(stem):
+    if "-W" in stem:
+        year, week = stem.split("-W")
+        return datetime.fromisocalendar(int(year), int(week), 6).replace(tzinfo=timezone.utc)
+    return datetime.strptime(stem, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+def collect_feed_items(sources):
+    recent = {}
+    for source in sources:
+        recent.setdefault(source[1], []).append(source)
+
+    items = []
+    for domain_key, domain_sources in recent.items():
+        domain_sources.sort(key=lambda s: s[2], reverse=True)
+        for _, _, stem, source_path in domain_sources[:FEED_RECENT_FILES]:
+            published = stem_to_datetime(stem)
+            page_url = f"{SITE_URL}/{page_rel_path(domain_key, stem)}" if SITE_URL else page_rel_path(domain_key, stem)
+            for pick in load_picks(source_path):
+                items.append({
+                    "id": f"{domain_key}/{stem}/{pick.get('id', '')}",
+                    "url": pick.get('url', page_url),
+                    "external_url": page_url,
+                    "title": pick.get('title', 'No Title'),
+                    "content_text": pick.get('reason_zh') or pick.get('reason_en') or pick.get('summary', ''),
+                    "date_published": published.isoformat(),
+                    "authors": [{"name": pick.get('authors', '')}],
+                    "tags": [domain_key],
+                })
+    items.sort(key=lambda it: it["date_published"], reverse=True)
+    return items
+
+
+def render_json_feed(items):
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": SITE_TITLE,
+        "items": items,
+    }
+    if SITE_URL:
+        feed["home_page_url"] = f"{SITE_URL}/index.html"
+        feed["feed_url"] = f"{SITE_URL}/feed.json"
+    return json.dumps(feed, ensure_ascii=False, separators=(',', ':'))
+
+
+def render_rss(items):
+    esc = html.escape
+    entries = "".join(
+        f"<item><title>{esc(it['title'])}</title><link>{esc(it['url'])}</link>"
+        f"<guid isPermaLink=\"false\">{esc(it['id'])}</guid>"
+        f"<pubDate>{format_datetime(datetime.fromisoformat(it['date_published']))}</pubDate>"
+        f"<description>{esc(it['content_text'])}</description></item>"
+        for it in items
+    )
+    return (
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<rss version=\"2.0\"><channel>"
+        f"<title>{esc(SITE_TITLE)}</title><link>{esc(SITE_URL or 'index.html')}</link>"
+        f"<description>{esc(SITE_TITLE)}</description>{entries}</channel></rss>\n"
+    )
+
+
+def render_atom(items):
+    esc = html.escape
+    updated = items[0]['date_published'] if items else datetime.now(timezone.utc).isoformat()
+    entries = "".join(
+        f"<entry><title>{esc(it['title'])}</title><link href=\"{esc(it['url'])}\"/>"
+        f"<id>urn:digest:{esc(it['id'])}</id><updated>{it['date_published']}</updated>"
+        f"<summary>{esc(it['content_text'])}</summary></entry>"
+        for it in items
+    )
+    return (
+        "<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<feed xmlns=\"http://www.w3.org/2005/Atom\">"
+        f"<title>{esc(SITE_TITLE)}</title><id>urn:digest:{esc(SITE_URL or 'local')}</id>"
+        f"<updated>{updated}</updated>{entries}</feed>\n"
+    )
+
+
+# --------------------------------------------------------------------------
+# 增量导出
+# --------------------------------------------------------------------------
+def export_site(archive_dir=ARCHIVE_DIR, site_dir=SITE_DIR, rss=False, atom=False):
+    """
+    将归档渲染为静态站点。只重建内容哈希发生变化的页面；
+    索引和 feed 仅在有页面变化（或首次生成）时重写。
+    """
+    if not SITE_URL:
+        logger.warning("未设置 DIGEST_SITE_URL，feed 中的链接将是相对路径，订阅器无法解析。")
+    manifest = load_manifest(site_dir)
+    old_sources = manifest["sources"]
+    new_sources = {}
+    sources = scan_sources(archive_dir)
+    rebuilt = 0
+
+    for kind, domain_key, stem, source_path in sources:
+        rel_source = os.path.relpath(source_path, archive_dir).replace(os.sep, "/")
+        digest = file_sha256(source_path)
+        rel_page = page_rel_path(domain_key, stem)
+        new_sources[rel_source] = {"sha256": digest, "page": rel_page}
+
+        page_path = os.path.join(site_dir, rel_page)
+        if old_sources.get(rel_source, {}).get("sha256") == digest and os.path.exists(page_path):
+            continue
+
+        picks = load_picks(source_path)
+        heading = f"{domain_title(domain_key)} · {stem}"
+        if kind == "daily":
+            empty_text = "今日 AI 编辑未发现值得一读的论文。 / The AI Editor found no 'must-reads' today."
+        else:
+            empty_text = "本周 AI 编辑未发现值得一读的教程。 / The AI Editor found no 'must-read' tutorials this week."
+        write_text(page_path, render_picks_page(heading, picks, empty_text))
+        rebuilt += 1
+
+    removed = [s for s in old_sources if s not in new_sources]
+    for rel_source in removed:
+        page_path = os.path.join(site_dir, old_sources[rel_source]["page"])
+        if os.path.exists(page_path):
+            os.remove(page_path)
+
+    feed_targets = [("feed.json", True), ("feed.xml", rss), ("atom.xml", atom)]
+    outputs_missing = not os.path.exists(os.path.join(site_dir, "index.html")) or any(
+        enabled and not os.path.exists(os.path.join(site_dir, name)) for name, enabled in feed_targets
+    )
+    if rebuilt or removed or outputs_missing:
+        write_text(os.path.join(site_dir, "index.html"), render_index(sources))
+        items = collect_feed_items(sources)
+        write_text(os.path.join(site_dir, "feed.json"), render_json_feed(items))
+        if rss:
+            write_text(os.path.join(site_dir, "feed.xml"), render_rss(items))
+        if atom:
+            write_text(os.path.join(site_dir, "atom.xml"), render_atom(items))
+
+    # 禁用 Jekyll，GitHub Pages 原样发布这些静态文件
+    nojekyll_path = os.path.join(site_dir, ".nojekyll")
+    if not os.path.exists(nojekyll_path):
+        write_text(nojekyll_path, "")
+
+    manifest["sources"] = new_sources
+    write_text(os.path.join(site_dir, MANIFEST_NAME), json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True))
+    logger.info(f"静态站点导出完毕：重建 {rebuilt} 页，删除 {len(removed)} 页，共 {len(sources)} 页。")
+    return rebuilt
+
+
+# --------------------------------------------------------------------------
+# 主函数
+# --------------------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="将 archive/ 增量导出为静态 HTML 站点与 JSON feed")
+    parser.add_argument("--archive", default=ARCHIVE_DIR)
+    parser.add_argument("--out", default=SITE_DIR)
+    parser.add_argument("--rss", action="store_true", help="额外生成 RSS 2.0 (feed.xml)")
+    parser.add_argument("--atom", action="store_true", help="额外生成 Atom (atom.xml)")
+    args = parser.parse_args()
+
+    export_site(args.archive, args.out, rss=args.rss, atom=args.atom)
@@ -3,6 +3,7 @@ import json
 import os
 from datetime import date, timedelta
 import re  # 用于每周教程自动扫描文件名
+from paper_reranker import record_feedback, load_feedback, feedback_path
 
 # --- 1. 配置 (V18 - 自动历史周 + 每日精选完整保留) ---
 ARCHIVE_DIR = "archive"
@@ -69,6 +70,7 @@ with tab_daily:
             st.subheader(domain_name, divider="rainbow")
 
             file_path = os.path.join(ARCHIVE_DIR, domain_key, f"{selected_date.isoformat()}.json")
+            feedback = load_feedback(domain_key)
             try:
                 with open(file_path, 'r', encoding='utf-8') as f:
                     picks_list = json.load(f)
@@ -119,6 +121,25 @@ with tab_daily:
                         else:
                             st.markdown(f"*{pdf_label}*")
 
+                        # ---------- 反馈（训练本地重排模型） ----------
+                        # key 带上序号 j：部分归档文件同一论文出现两次，重复 key 会让 Streamlit 报错
+                        paper_id = pick.get('id')
+                        if paper_id:
+                            fb_cols = st.columns(2)
+                            like_label = "👍 有用" if lang == "简体中文" else "👍 Useful"
+                            dismiss_label = "👎 不感兴趣" if lang == "简体中文" else "👎 Dismiss"
+                            if fb_cols[0].button(like_label, key=f"like_{domain_key}_{j}_{paper_id}"):
+                                record_feedback(domain_key, pick, 1)
+                                feedback[paper_id] = {'label': 1}
+                            if fb_cols[1].button(dismiss_label, key=f"dismiss_{domain_key}_{j}_{paper_id}"):
+                                record_feedback(domain_key, pick, 0)
+                                feedback[paper_id] = {'label': 0}
+                            if paper_id in feedback:
+                                if feedback[paper_id]['label'] == 1:
+                                    st.caption("已标记：有用" if lang == "简体中文" else "Marked: useful")
+                                else:
+                                    st.caption("已标记：不感兴趣" if lang == "简体中文" else "Marked: dismissed")
+
                         if j < len(picks_list) - 1:
                             st.divider()
                 else:
@@ -130,6 +151,21 @@ with tab_daily:
             except json.JSONDecodeError:
                 st.error("JSON 文件损坏或格式错误。")
 
+            # ---------- 导出反馈（提交到仓库 feedback/ 后 CI 才能用来重排） ----------
+            feedback_file = feedback_path(domain_key)
+            if os.path.exists(feedback_file):
+                with open(feedback_file, 'rb') as f:
+                    st.download_button(
+                        "导出反馈 (JSONL)" if lang == "简体中文" else "Export feedback (JSONL)",
+                        data=f.read(),
+                        file_name=os.path.basename(feedback_file),
+                        mime="application/jsonl",
+                        key=f"export_feedback_{domain_key}",
+                        help=(f"提交到仓库的 {feedback_file} 后，每日任务才会用它重排候选论文。"
+                              if lang == "简体中文" else
+                              f"Commit it to {feedback_file} in the repo so the daily job can rerank with it.")
+                    )
+
 # --------------------------------------------------------------------------
 # 每周教程标签页（V18 - 自动扫描所有历史周）
 # --------------------------------------------------------------------------